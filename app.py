@@ -9,19 +9,58 @@
 from datetime import datetime, timedelta
 from functools import wraps
 import threading
+import logging
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 load_dotenv()
 
+# Module loggers (malaria, maternal, epi) inherit this; set LOG_LEVEL=DEBUG
+# to see per-request DHIS2 diagnostics.
+# Request threads only enqueue records; a listener thread does the formatting
+# and stderr writes, so logging never blocks a request on the stream lock.
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+_log_queue_handler = QueueHandler(queue.SimpleQueue())
+# Only merge args (and any traceback) into the message here; the stream
+# handler applies the full format on the listener thread
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_listener = None
+
+def _start_log_listener():
+    """(Re)start the log listener thread with a fresh queue"""
+    global _log_listener
+    _log_queue_handler.queue = queue.SimpleQueue()
+    _log_listener = QueueListener(_log_queue_handler.queue, _log_stream_handler)
+    _log_listener.start()
+
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'WARNING').upper(),
+    handlers=[_log_queue_handler]
+)
+_start_log_listener()
+# Threads do not survive fork; gunicorn (preload_app) workers need their own listener.
+# Windows has no fork (or os.register_at_fork), so the listener above is enough there
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_start_log_listener)
+atexit.register(lambda: _log_listener.stop())
+
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'epi-dashboard-secret-key-2024')
 CORS(app)
 
+# Pooled keep-alive session shared with the blueprints
+from modules.core import http_session
+import modules.core as core
+
 # Register Blueprints
 from modules.reporting import reporting_bp
 from modules.maternal import maternal_bp
 from modules.epi import epi_bp
 from modules.wash import wash_bp
 from modules.malaria import malaria_bp
+from modules.malaria.routes import clear_malaria_caches
 app.register_blueprint(reporting_bp)
 app.register_blueprint(maternal_bp)
 app.register_blueprint(epi_bp)
@@ -234,7 +273,7 @@ def login():
         
         # Test credentials against DHIS2
         try:
-            response = requests.get(
+            response = http_session.get(
                 f"{DHIS2_BASE_URL}/me",
                 auth=HTTPBasicAuth(username, password),
                 params={'fields': 'id,displayName'},
@@ -260,6 +299,11 @@ def logout():
     session.clear()
     return redirect(url_for('login'))
 
+@app.route('/health')
+def health():
+    """Liveness probe - answers from memory, never waits on DHIS2"""
+    return jsonify({'status': 'ok'})
+
 @app.route('/api/check-auth')
 def check_auth():
     if is_logged_in():
@@ -293,6 +337,12 @@ def clear_cache():
     data_elements_cache.clear()
     analytics_cache.clear()
     search_cache.clear()
+    # The blueprints cache through modules.core, not the instances above
+    core.org_units_cache.clear()
+    core.data_elements_cache.clear()
+    core.analytics_cache.clear()
+    core.search_cache.clear()
+    clear_malaria_caches()
     return jsonify({'success': True, 'message': 'All caches cleared'})
 
 def fetch_org_units_cached(auth, parent_id=None):
@@ -304,10 +354,10 @@ def fetch_org_units_cached(auth, parent_id=None):
     
     try:
         if parent_id:
-            response = requests.get(f"{DHIS2_BASE_URL}/organisationUnits/{parent_id}",
+            response = http_session.get(f"{DHIS2_BASE_URL}/organisationUnits/{parent_id}",
                 auth=auth, params={'fields': 'id,displayName,children[id,displayName,level,childCount]'}, timeout=30)
         else:
-            response = requests.get(f"{DHIS2_BASE_URL}/organisationUnits",
+            response = http_session.get(f"{DHIS2_BASE_URL}/organisationUnits",
                 auth=auth, params={'level': 1, 'fields': 'id,displayName,level,childCount', 'paging': 'false'}, timeout=30)
         
         if response.status_code == 200:
@@ -343,7 +393,7 @@ def get_org_unit_details(org_unit_id):
         return jsonify(cached)
 
     try:
-        response = requests.get(
+        response = http_session.get(
             f"{DHIS2_BASE_URL}/organisationUnits/{org_unit_id}",
             auth=auth,
             params={'fields': 'id,displayName,level,ancestors[id,displayName,level]'},
@@ -354,7 +404,7 @@ def get_org_unit_details(org_unit_id):
         search_cache.set(cache_key, org_unit, ttl=3600)  # Cache for 1 hour
         return jsonify(org_unit)
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching org unit details for {org_unit_id}: {e}")
+        logging.getLogger(__name__).warning("Error fetching org unit details for %s: %s", org_unit_id, e)
         return jsonify({'error': 'Failed to fetch organization unit details', 'details': str(e)}), 500
 
 @app.route('/api/districts')
@@ -379,7 +429,7 @@ def search_org_units():
     
     try:
         # Search for org units by name
-        response = requests.get(
+        response = http_session.get(
             f"{DHIS2_BASE_URL}/organisationUnits",
             auth=auth,
             params={
@@ -441,7 +491,7 @@ def get_org_units_descendants():
 
     try:
         # Get parent path first
-        parent_resp = requests.get(
+        parent_resp = http_session.get(
             f"{DHIS2_BASE_URL}/organisationUnits/{parent_id}",
             auth=auth,
             params={'fields': 'id,displayName,path,level'},
@@ -467,7 +517,7 @@ def get_org_units_descendants():
             filters.append(f"level:eq:{level}")
         params['filter'] = filters
 
-        resp = requests.get(
+        resp = http_session.get(
             f"{DHIS2_BASE_URL}/organisationUnits",
             auth=auth,
             params=params,
@@ -498,7 +548,7 @@ def fetch_data_elements_cached(auth, pattern='105-CL'):
         return cached
     
     try:
-        response = requests.get(f"{DHIS2_BASE_URL}/dataElements",
+        response = http_session.get(f"{DHIS2_BASE_URL}/dataElements",
             auth=auth, params={'filter': f'code:like:{pattern}', 'fields': 'id,code,displayName,shortName', 'paging': 'false'}, timeout=30)
         
         if response.status_code == 200:
@@ -560,7 +610,7 @@ def get_raw_data():
             dx_dimension = ";".join(ids)
             params = [('dimension', f'dx:{dx_dimension}'), ('dimension', f'pe:{periods}'),
                       ('dimension', f'ou:{org_unit}'), ('displayProperty', 'NAME'), ('skipMeta', 'false')]
-            data_response = requests.get(f"{DHIS2_BASE_URL}/analytics", auth=auth, params=params, timeout=60)
+            data_response = http_session.get(f"{DHIS2_BASE_URL}/analytics", auth=auth, params=params, timeout=60)
             if data_response.status_code == 200:
                 data = data_response.json()
                 data['dataElementMeta'] = {e['id']: e for e in elements}
@@ -596,7 +646,7 @@ def trend_analysis():
     try:
         params = [('dimension', f'dx:{indicator_id}'), ('dimension', f'pe:{periods}'),
                   ('dimension', f'ou:{org_unit}'), ('displayProperty', 'NAME'), ('skipMeta', 'false')]
-        response = requests.get(f"{DHIS2_BASE_URL}/analytics", auth=auth, params=params, timeout=60)
+        response = http_session.get(f"{DHIS2_BASE_URL}/analytics", auth=auth, params=params, timeout=60)
         
         if response.status_code == 200:
             data = response.json()
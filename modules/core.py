@@ -44,10 +44,13 @@ class SimpleCache:
     """Thread-safe in-memory cache with expiration
     For production with 10,000+ users, use Redis instead
     """
-    def __init__(self, default_ttl=300):
+    def __init__(self, default_ttl=300, max_entries=None):
         self._cache = {}
         self._lock = threading.Lock()
         self.default_ttl = default_ttl
+        # Expired entries are only dropped when read again; a cap keeps
+        # one-off keys from piling up in long-lived workers
+        self.max_entries = max_entries
     
     def _make_key(self, *args, **kwargs):
         """Generate cache key from args"""
@@ -60,6 +63,9 @@ def get(self, key):
             if key in self._cache:
                 item = self._cache[key]
                 if datetime.now() < item['expires']:
+                    if self.max_entries is not None:
+                        # Keep insertion order = least recently used first
+                        self._cache[key] = self._cache.pop(key)
                     return item['value']
                 else:
                     del self._cache[key]
@@ -70,11 +76,22 @@ def set(self, key, value, ttl=None):
         if ttl is None:
             ttl = self.default_ttl
         with self._lock:
+            self._cache.pop(key, None)
             self._cache[key] = {
                 'value': value,
                 'expires': datetime.now() + timedelta(seconds=ttl),
                 'created': datetime.now()
             }
+            if self.max_entries is not None and len(self._cache) > self.max_entries:
+                self._evict()
+    
+    def _evict(self):
+        """Drop expired entries, then the least recently used until under the cap"""
+        now = datetime.now()
+        for key in [k for k, v in self._cache.items() if now >= v['expires']]:
+            del self._cache[key]
+        while len(self._cache) > self.max_entries:
+            del self._cache[next(iter(self._cache))]
     
     def delete(self, key):
         """Remove item from cache"""
@@ -102,7 +119,7 @@ def stats(self):
 # Initialize cache instances with appropriate TTLs
 org_units_cache = SimpleCache(default_ttl=3600)      # 1 hour
 data_elements_cache = SimpleCache(default_ttl=3600)  # 1 hour
-analytics_cache = SimpleCache(default_ttl=300)       # 5 minutes
+analytics_cache = SimpleCache(default_ttl=300, max_entries=1000)  # 5 minutes
 search_cache = SimpleCache(default_ttl=600)          # 10 minutes
 
 
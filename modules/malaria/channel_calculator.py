@@ -6,7 +6,7 @@
 import pandas as pd
 import numpy as np
 
-from modules.malaria.config import PERCENTILES, ALERT_SETTINGS
+from modules.malaria.config import PERCENTILES, ALERT_SETTINGS, EPIDEMIOLOGICAL_WEEKS
 from modules.malaria.utils import (
     safe_float, safe_int,
     get_alert_status, get_alert_color, 
@@ -46,11 +46,12 @@ def _ensure_numeric_df(self, df):
         
         return df
     
-    def calculate_channel(self, baseline_df):
+    def calculate_channel(self, baseline_df, last_week=EPIDEMIOLOGICAL_WEEKS):
         """
         Calculate endemic channel thresholds from baseline data
         Args:
             baseline_df: DataFrame with columns [year, epi_week, confirmed_cases]
+            last_week: Final week of the channel (53 for long ISO years)
         Returns:
             DataFrame with columns [epi_week, q1, median, q3, q85, mean, std]
         """
@@ -60,7 +61,7 @@ def calculate_channel(self, baseline_df):
         # Group by epidemiological week
         channel_data = []
         
-        for week in range(1, 53):
+        for week in range(1, last_week + 1):
             week_mask = baseline_df['epi_week'] == week
             week_values = baseline_df.loc[week_mask, 'confirmed_cases'].tolist()
             
@@ -352,9 +353,11 @@ def get_trend_indicator(self, analysis_df, window=4):
         if len(analysis_df) < window + 1:
             return 'insufficient_data'
         
-        # Ensure numeric and sort
+        # Ensure numeric and sort (callers usually pass week-ordered frames,
+        # so only sort when the weeks are actually out of order)
         analysis_df = self._ensure_numeric_df(analysis_df.copy())
-        analysis_df = analysis_df.sort_values('epi_week')
+        if not analysis_df['epi_week'].is_monotonic_increasing:
+            analysis_df = analysis_df.sort_values('epi_week')
         
         recent_data = analysis_df.tail(window + 1)
         
@@ -2,6 +2,7 @@
 Configuration for Malaria Endemic Channel
 Thresholds, colors, and visualization settings
 """
+import os
 
 # DHIS2 Data Element
 MALARIA_DATA_ELEMENT = {
@@ -10,6 +11,10 @@
     'name': 'Malaria (Confirmed) - Cases'
 }
 
+# Set MALARIA_DISABLE_ELEMENT_DISCOVERY=1 where the ID above is known to be
+# valid, to use it directly instead of verifying/searching DHIS2 per user
+MALARIA_ELEMENT_DISCOVERY = os.getenv('MALARIA_DISABLE_ELEMENT_DISCOVERY') != '1'
+
 # Baseline period configuration
 BASELINE_YEARS = 5  # Number of years for baseline calculation
 EPIDEMIOLOGICAL_WEEKS = 52  # Standard epi weeks per year
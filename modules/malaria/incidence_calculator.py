@@ -84,10 +84,8 @@ def calculate_quartile_classification(incidence_data):
         
         return color_mapping, {'median': median}
     
-    # Calculate quartiles
-    q25 = float(np.percentile(valid_values, 25))
-    q50 = float(np.percentile(valid_values, 50))  # Median
-    q75 = float(np.percentile(valid_values, 75))
+    # Calculate quartiles (one percentile call sorts the values once)
+    q25, q50, q75 = (float(q) for q in np.percentile(valid_values, [25, 50, 75]))  # q50 = median
     
     color_mapping = {}
     
@@ -178,6 +176,66 @@ def rank_orgunits_by_incidence(incidence_data):
     return ranked_data
 
 
+# (quartile, color, label) per quartile class, in ascending order
+QUARTILE_CLASSES = (
+    ('Q1', '#4CAF50', 'Q1 (Low)'),       # Green — Low burden
+    ('Q2', '#FFEB3B', 'Q2 (Moderate)'),  # Yellow — Moderate
+    ('Q3', '#FF9800', 'Q3 (Elevated)'),  # Orange — Elevated
+    ('Q4', '#F44336', 'Q4 (High)'),      # Red — High burden
+)
+
+
+def classify_and_rank_orgunits(incidence_data):
+    """
+    Quartile classification and ranking for the incidence map in one call.
+    
+    Args:
+        incidence_data (dict): {orgunit_id: incidence_value}
+    
+    Returns:
+        tuple: (color_mapping, thresholds, rank_by_ou)
+            - color_mapping, thresholds: as calculate_quartile_classification
+            - rank_by_ou: {orgunit_id: rank}, 1 = highest incidence; ties keep
+              input order as in rank_orgunits_by_incidence
+    """
+    valid_ous = [ou for ou, inc in incidence_data.items() if inc is not None]
+    values = np.fromiter((incidence_data[ou] for ou in valid_ous), dtype=np.float64, count=len(valid_ous))
+    
+    # Stable sort on the negated values = descending with ties in input order
+    order = np.argsort(-values, kind='stable')
+    rank_by_ou = {valid_ous[i]: rank + 1 for rank, i in enumerate(order.tolist())}
+    
+    if len(values) < 4:
+        # No data / median split - nothing worth vectorizing
+        color_mapping, thresholds = calculate_quartile_classification(incidence_data)
+        return color_mapping, thresholds, rank_by_ou
+    
+    quartiles = np.percentile(values, [25, 50, 75])
+    # side='left' gives 0 for v <= q25, 1 for q25 < v <= q50, and so on,
+    # the same boundaries as the comparison chain in calculate_quartile_classification
+    classes = np.searchsorted(quartiles, values, side='left')
+    
+    classified = {
+        ou: {'quartile': quartile, 'color': color, 'incidence': round(incidence, 2), 'label': label}
+        for ou, incidence, (quartile, color, label) in zip(
+            valid_ous, values.tolist(), (QUARTILE_CLASSES[c] for c in classes.tolist())
+        )
+    }
+    color_mapping = {
+        ou: classified.get(ou) or {'quartile': 'NO_DATA', 'color': '#BDBDBD', 'incidence': None, 'label': 'No Data'}
+        for ou in incidence_data
+    }
+    
+    q25, q50, q75 = (float(q) for q in quartiles)
+    thresholds = {
+        'q25': round(q25, 2),
+        'q50': round(q50, 2),
+        'q75': round(q75, 2)
+    }
+    
+    return color_mapping, thresholds, rank_by_ou
+
+
 def handle_missing_weeks(data, expected_weeks, orgunit_id):
     """
     Fill in missing weeks with zero cases.
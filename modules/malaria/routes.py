@@ -3,31 +3,86 @@
 Uses session-based authentication like other modules
 """
 
-from flask import render_template, request, jsonify, session
+from flask import render_template, request, jsonify, session, Response
+from requests import RequestException
 from requests.auth import HTTPBasicAuth
 from datetime import datetime
-import traceback
-import requests
+from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor, Future
+from itertools import islice
+import logging
+import re
+import threading
 import pandas as pd
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from modules.core import http_session, search_cache, analytics_cache, org_units_cache, SimpleCache
 from modules.malaria import malaria_bp
 from modules.malaria.channel_calculator import EndemicChannelCalculator
-from modules.malaria.config import MALARIA_DATA_ELEMENT, BASELINE_YEARS
-from modules.malaria.utils import safe_float, safe_int
+from modules.malaria.config import MALARIA_DATA_ELEMENT, MALARIA_ELEMENT_DISCOVERY, BASELINE_YEARS
+from modules.malaria.utils import (
+    get_weekly_periods, get_weekly_period_param, get_last_epi_week, iter_csv_chunks
+)
 from modules.malaria.incidence_calculator import (
-    calculate_incidence, calculate_quartile_classification,
-    calculate_weekly_incidence, rank_orgunits_by_incidence
+    calculate_incidence, classify_and_rank_orgunits
 )
 
+logger = logging.getLogger(__name__)
+
 # Import UBOS Population data
 # This is the official Uganda Bureau of Statistics population data
 from modules.malaria.ubos_population import UBOS_POPULATION
-print(f"Loaded UBOS_POPULATION with {len(UBOS_POPULATION)} districts")
+logger.debug("Loaded UBOS_POPULATION with %d districts", len(UBOS_POPULATION))
 
 # Use the same DHIS2 URL as main app
 DHIS2_BASE_URL = 'https://hmis.health.go.ug/api'
 
+ANALYTICS_ENDPOINT = f"{DHIS2_BASE_URL}/analytics"
+
+# Fixed options for Analytics queries that need names from metaData;
+# per-request dimensions are prepended to this tuple
+ANALYTICS_META_PARAMS = (('displayProperty', 'NAME'), ('skipMeta', 'false'))
+
+# Level-wide dumps (every org unit at a level) can exceed the Analytics
+# cell limit at lower levels; lift it so one request returns all rows
+ANALYTICS_LEVEL_PARAMS = ANALYTICS_META_PARAMS + (('ignoreLimit', 'true'),)
+
+# Pre-built Analytics query for the dx/pe/ou shape used by the weekly fetches.
+# Filling a template skips re-encoding a params list on every request;
+# values must already be URL-encoded (see analytics_url).
+ANALYTICS_URL_TEMPLATE = (
+    ANALYTICS_ENDPOINT
+    + "?dimension=dx:{dx}&dimension=pe:{pe}&dimension=ou:{ou}"
+    "&displayProperty=NAME&skipMeta={skip_meta}"
+)
+
+# Shared worker pool for per-year Analytics requests.
+# Threads start lazily, so this is safe with gunicorn's preload_app.
+# Only leaf fetches run here - never submit work that waits on this pool.
+ANALYTICS_MAX_WORKERS = 16
+_analytics_executor = ThreadPoolExecutor(
+    max_workers=ANALYTICS_MAX_WORKERS,
+    thread_name_prefix='malaria-analytics'
+)
+
+
+def analytics_url(dx, pe_param, ou, skip_meta=True):
+    """
+    Build a weekly Analytics URL from the template
+    pe_param must already be encoded (get_weekly_period_param)
+    """
+    return ANALYTICS_URL_TEMPLATE.format(
+        dx=quote_plus(dx),
+        pe=pe_param,
+        ou=quote_plus(ou),
+        skip_meta='true' if skip_meta else 'false'
+    )
+
 
 def is_logged_in():
     """Check if user is logged in"""
@@ -41,6 +96,177 @@ def get_auth():
     return None
 
 
+# ETag + body of DHIS2 metadata responses, for If-None-Match revalidation
+metadata_etag_cache = SimpleCache(default_ttl=86400)  # 1 day
+
+
+def get_metadata(auth, path, params, timeout=30):
+    """
+    GET a DHIS2 metadata resource, revalidating with If-None-Match.
+    Returns (status_code, data). A 304 from DHIS2 is reported as 200
+    with the previously stored body, so callers treat both the same.
+    """
+    cache_key = metadata_etag_cache._make_key(auth.username, path, params)
+    stored = metadata_etag_cache.get(cache_key)
+    headers = {'If-None-Match': stored['etag']} if stored else {}
+    
+    response = http_session.get(
+        f"{DHIS2_BASE_URL}/{path}",
+        auth=auth,
+        params=params,
+        headers=headers,
+        timeout=timeout
+    )
+    
+    if response.status_code == 304 and stored:
+        return 200, stored['data']
+    if response.status_code != 200:
+        return response.status_code, None
+    
+    data = parse_json(response)
+    etag = response.headers.get('ETag')
+    if etag:
+        metadata_etag_cache.set(cache_key, {'etag': etag, 'data': data})
+    return 200, data
+
+
+def search_metadata_any(auth, path, filters, fields, timeout=30):
+    """
+    Search a DHIS2 metadata collection for items matching ANY of the
+    (property, value) ilike filters, in one rootJunction=OR request
+    Returns the matched items, or None if the request failed
+    """
+    status_code, data = get_metadata(
+        auth,
+        path,
+        [('filter', f'{prop}:ilike:{value}') for prop, value in filters] + [
+            ('rootJunction', 'OR'),
+            ('fields', fields),
+            ('paging', 'false')
+        ],
+        timeout=timeout
+    )
+    if status_code != 200:
+        return None
+    return data.get(path, [])
+
+
+def ilike_matches(item, prop, value):
+    """Client-side equivalent of a DHIS2 ilike filter (case-insensitive substring)"""
+    return value.lower() in (item.get(prop) or '').lower()
+
+
+# Analytics results for completed years no longer change once reported;
+# anything touching the current year is only reused briefly
+ANALYTICS_TTL_HISTORICAL = 86400  # 1 day
+ANALYTICS_TTL_CURRENT = 300       # 5 minutes
+
+# ETag + body of Analytics responses; outlives the analytics_cache entry so
+# an expired query can be revalidated with If-None-Match instead of re-downloaded
+analytics_etag_cache = SimpleCache(default_ttl=86400, max_entries=500)  # 1 day
+
+
+# Requests currently running against DHIS2, by cache key (see single_flight)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def single_flight(key, fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) once per key at a time: concurrent callers with
+    the same key wait for the first call and share its result (or exception)
+    instead of repeating the same slow DHIS2 request.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    
+    if leader:
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            # Also resolve on gevent.Timeout / SystemExit so followers never hang
+            future.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+    
+    return future.result()
+
+
+def get_analytics(auth, url, params=None, ttl=ANALYTICS_TTL_CURRENT, timeout=60, refresh=False):
+    """
+    GET an Analytics query through the shared analytics_cache.
+    Returns (status_code, data); only successful responses are cached,
+    keyed per user so results never cross account permissions.
+    refresh=True skips the lookup but still stores the new response.
+    On a miss, a previously seen ETag is sent as If-None-Match and a 304
+    reuses the stored body without downloading it again.
+    The returned data is shared between requests - do not mutate it.
+    """
+    cache_key = analytics_cache._make_key('malaria_analytics', auth.username, url, params)
+    cached = None if refresh else analytics_cache.get(cache_key)
+    if cached is not None:
+        return 200, cached
+    
+    # Identical queries already in flight (e.g. a dashboard reload) share one call
+    return single_flight(cache_key, _fetch_analytics, auth, url, params, ttl, timeout, cache_key)
+
+
+def _fetch_analytics(auth, url, params, ttl, timeout, cache_key):
+    """Uncached half of get_analytics: one DHIS2 request, stored on success"""
+    stored = analytics_etag_cache.get(cache_key)
+    headers = {'If-None-Match': stored['etag']} if stored else {}
+    
+    response = http_session.get(url, auth=auth, params=params, headers=headers, timeout=timeout)
+    if response.status_code == 304 and stored:
+        analytics_cache.set(cache_key, stored['data'], ttl=ttl)
+        return 200, stored['data']
+    if response.status_code != 200:
+        logger.warning("Analytics error: %s - %s", response.status_code, response.text[:500])
+        return response.status_code, None
+    
+    data = parse_json(response)
+    analytics_cache.set(cache_key, data, ttl=ttl)
+    etag = response.headers.get('ETag')
+    if etag:
+        analytics_etag_cache.set(cache_key, {'etag': etag, 'data': data})
+    return 200, data
+
+
+def parse_json(response):
+    """Decode a DHIS2 response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def analytics_value_lookup(rows, key_index):
+    """
+    Map one column of analytics rows ([dx, pe, ou, value]) to the row value,
+    e.g. key_index=1 for {period: value}. Values are parsed in one vectorized
+    pass; unparseable values become 0.0, as with safe_float.
+    """
+    if not rows:
+        return {}
+    columns = list(zip(*rows))
+    values = pd.to_numeric(pd.Series(columns[3], dtype=object), errors='coerce').fillna(0.0)
+    return dict(zip(columns[key_index], values.tolist()))
+
+
+def json_response(data):
+    """Serialize a large payload with orjson when available, else jsonify"""
+    if orjson is not None:
+        return Response(
+            orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+            mimetype='application/json'
+        )
+    return jsonify(data)
+
+
 def require_login(f):
     """Decorator to require login"""
     from functools import wraps
@@ -61,6 +287,56 @@ def malaria_dashboard():
     return render_template('malaria.html')
 
 
+# Channel results are reused for 30 minutes (dashboard payload and computed frames)
+CHANNEL_CACHE_TTL = 1800
+
+# Computed channel DataFrames, kept apart from analytics_cache with a small cap
+channel_frames_cache = SimpleCache(default_ttl=CHANNEL_CACHE_TTL, max_entries=32)
+
+
+def compute_channel_analysis(auth, orgunit_id, current_year, threshold, refresh=False):
+    """
+    Fetch baseline/current data and compute the endemic channel and alerts.
+    Returns (baseline_df, current_df, channel_df, analysis_df). Results are
+    cached per user so the CSV export reuses what the dashboard computed;
+    callers must treat the returned frames as read-only.
+    """
+    cache_key = channel_frames_cache._make_key(auth.username, orgunit_id, current_year, threshold)
+    if not refresh:
+        cached = channel_frames_cache.get(cache_key)
+        if cached:
+            return cached
+    
+    # Get baseline data (5 years) and current year data concurrently
+    start_year = current_year - BASELINE_YEARS
+    end_year = current_year - 1
+    baseline_df, current_df = fetch_baseline_and_current(
+        auth, orgunit_id, start_year, end_year, current_year, refresh=refresh
+    )
+    
+    if baseline_df.empty or current_df.empty:
+        return baseline_df, current_df, pd.DataFrame(), pd.DataFrame()
+    
+    # Calculate endemic channel
+    calculator = EndemicChannelCalculator(threshold_percentile=threshold)
+    channel_df = calculator.calculate_channel(baseline_df, last_week=get_last_epi_week(current_year))
+    
+    # Detect alerts and calculate z-scores
+    analysis_df = calculator.detect_alerts(current_df, channel_df)
+    analysis_df = calculator.calculate_z_scores(analysis_df)
+    
+    # Responses rely on week order without re-sorting (see get_channel_data);
+    # check the invariant only when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        for name, df in (('channel', channel_df), ('analysis', analysis_df)):
+            if not df['epi_week'].is_monotonic_increasing:
+                logger.debug("%s frame is not ordered by epi_week", name)
+    
+    result = (baseline_df, current_df, channel_df, analysis_df)
+    channel_frames_cache.set(cache_key, result)
+    return result
+
+
 @malaria_bp.route('/api/channel-data')
 @require_login
 def get_channel_data():
@@ -80,51 +356,48 @@ def get_channel_data():
         if not orgunit_id:
             return jsonify({'error': 'Organization unit ID required'}), 400
         
-        # Get baseline data (5 years)
-        start_year = current_year - BASELINE_YEARS
-        end_year = current_year - 1
+        # Check cache (pass refresh=1 to force a new DHIS2 fetch)
+        refresh = request.args.get('refresh') == '1'
+        cache_key = analytics_cache._make_key('malaria_channel', auth.username, orgunit_id, current_year, threshold)
+        if not refresh:
+            cached = analytics_cache.get(cache_key)
+            if cached:
+                return json_response(cached)
         
-        baseline_df = fetch_malaria_data(auth, orgunit_id, start_year, end_year)
+        baseline_df, current_df, channel_df, analysis_df = compute_channel_analysis(
+            auth, orgunit_id, current_year, threshold, refresh=refresh
+        )
         
         if baseline_df.empty:
             return jsonify({'error': 'No baseline data available'}), 404
         
-        # Get current year data
-        current_df = fetch_malaria_data(auth, orgunit_id, current_year, current_year)
-        
         if current_df.empty:
             return jsonify({'error': 'No current year data available'}), 404
         
-        # Calculate endemic channel
         calculator = EndemicChannelCalculator(threshold_percentile=threshold)
-        channel_df = calculator.calculate_channel(baseline_df)
-        
-        # Detect alerts
-        analysis_df = calculator.detect_alerts(current_df, channel_df)
-        
-        # Calculate z-scores
-        analysis_df = calculator.calculate_z_scores(analysis_df)
         
         # Get summaries
         alert_summary = calculator.get_alert_summary(analysis_df)
         zone_distribution = calculator.get_zone_distribution(analysis_df)
         year_comparisons = calculator.compare_years(baseline_df, current_df, channel_df)
-        trend = calculator.get_trend_indicator(analysis_df)
+        # The trend only reads weekly cases, so hand it just those columns
+        # rather than letting it copy the full analysis frame
+        trend = calculator.get_trend_indicator(analysis_df[['epi_week', 'confirmed_cases']])
         
-        # Sort all data by epi_week for proper chart display
-        channel_df = channel_df.sort_values('epi_week')
-        current_df = current_df.sort_values('epi_week')
-        analysis_df = analysis_df.sort_values('epi_week')
+        # No re-sort needed for chart display: fetch_malaria_data returns
+        # rows ordered by (year, epi_week), channel_df is built week by week,
+        # and the left merge in detect_alerts keeps current_df's order
         
-        # Prepare response
+        # Prepare response - tables use split orientation ({columns, data})
+        # so column names are sent once instead of once per week
         response_data = {
-            'channel': channel_df.to_dict('records'),
-            'current_data': current_df[['epi_week', 'confirmed_cases']].to_dict('records'),
+            'channel': channel_df.to_dict('split', index=False),
+            'current_data': current_df[['epi_week', 'confirmed_cases']].to_dict('split', index=False),
             'analysis': analysis_df[[
                 'epi_week', 'confirmed_cases', 'q1', 'median', 'q3', 'q85',
                 'is_alert', 'is_confirmed_alert', 'alert_zone', 'alert_status',
                 'deviation_percent', 'z_score'
-            ]].to_dict('records'),
+            ]].to_dict('split', index=False),
             'alert_summary': alert_summary,
             'zone_distribution': zone_distribution,
             'year_comparisons': year_comparisons,
@@ -138,11 +411,11 @@ def get_channel_data():
             }
         }
         
-        return jsonify(response_data)
+        analytics_cache.set(cache_key, response_data, ttl=CHANNEL_CACHE_TTL)
+        return json_response(response_data)
     
     except Exception as e:
-        print(f"Error in get_channel_data: {e}")
-        traceback.print_exc()
+        logger.exception("Error in get_channel_data: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -162,33 +435,26 @@ def export_channel_data():
         if not orgunit_id:
             return jsonify({'error': 'Organization unit ID required'}), 400
         
-        # Fetch data
-        start_year = current_year - BASELINE_YEARS
-        end_year = current_year - 1
-        baseline_df = fetch_malaria_data(auth, orgunit_id, start_year, end_year)
-        current_df = fetch_malaria_data(auth, orgunit_id, current_year, current_year)
+        # Reuses the dashboard's computation when it was just viewed
+        baseline_df, current_df, channel_df, analysis_df = compute_channel_analysis(
+            auth, orgunit_id, current_year, threshold
+        )
         
-        # Calculate
-        calculator = EndemicChannelCalculator(threshold_percentile=threshold)
-        channel_df = calculator.calculate_channel(baseline_df)
-        analysis_df = calculator.detect_alerts(current_df, channel_df)
+        if analysis_df.empty:
+            return jsonify({'error': 'No data available for export'}), 404
         
         # Prepare export
+        # Project and relabel in one step (the projection is already a copy)
         export_df = analysis_df[[
             'epi_week', 'confirmed_cases', 'q1', 'median', 'q3', 'q85',
             'is_alert', 'alert_zone', 'alert_status', 'deviation_percent'
-        ]].copy()
-        
-        export_df.columns = [
+        ]].set_axis([
             'Epi Week', 'Cases', 'Q1 (25th)', 'Median (50th)', 'Q3 (75th)', 'Q85 (85th)',
             'Is Alert', 'Alert Zone', 'Status', 'Deviation %'
-        ]
-        
-        csv_data = export_df.to_csv(index=False)
+        ], axis=1)
         
-        from flask import Response
         return Response(
-            csv_data,
+            iter_csv_chunks(export_df),
             mimetype='text/csv',
             headers={'Content-Disposition': f'attachment;filename=malaria_channel_{orgunit_id}_{current_year}.csv'}
         )
@@ -211,28 +477,32 @@ def search_orgunits():
         if len(query) < 2:
             return jsonify({'orgunits': []})
         
+        cache_key = search_cache._make_key('malaria_orgunit_search', session['username'], query.lower())
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            return json_response({'orgunits': cached})
+        
         # Search org units
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/organisationUnits",
-            auth=auth,
-            params={
+        status_code, data = get_metadata(
+            auth,
+            'organisationUnits',
+            {
                 'fields': 'id,displayName~rename(name),level',
                 'filter': f'displayName:ilike:{query}',
                 'paging': 'false'
-            },
-            timeout=30
+            }
         )
         
-        if response.status_code != 200:
-            return jsonify({'error': f'DHIS2 error: {response.status_code}'}), 500
+        if status_code != 200:
+            return jsonify({'error': f'DHIS2 error: {status_code}'}), 500
         
-        data = response.json()
         orgunits = data.get('organisationUnits', [])
+        search_cache.set(cache_key, orgunits)
         
-        return jsonify({'orgunits': orgunits})
+        return json_response({'orgunits': orgunits})
     
     except Exception as e:
-        print(f"Error in search_orgunits: {e}")
+        logger.error("Error in search_orgunits: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -247,49 +517,34 @@ def search_data_elements():
         
         query = request.args.get('query', 'malaria')
         
-        # Search data elements
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/dataElements",
-            auth=auth,
-            params={
-                'fields': 'id,code,displayName,shortName',
-                'filter': f'displayName:ilike:{query}',
-                'paging': 'false'
-            },
-            timeout=30
+        cache_key = search_cache._make_key('malaria_element_search', session['username'], query.lower())
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            return jsonify({'dataElements': cached})
+        
+        # Search data elements by name OR by the malaria code pattern
+        status_code, data = get_metadata(
+            auth,
+            'dataElements',
+            [
+                ('fields', 'id,code,displayName,shortName'),
+                ('filter', f'displayName:ilike:{query}'),
+                ('filter', 'code:ilike:033B-CD01'),
+                ('rootJunction', 'OR'),
+                ('paging', 'false')
+            ]
         )
         
-        if response.status_code != 200:
-            return jsonify({'error': f'DHIS2 error: {response.status_code}'}), 500
+        if status_code != 200:
+            return jsonify({'error': f'DHIS2 error: {status_code}'}), 500
         
-        data = response.json()
         elements = data.get('dataElements', [])
-        
-        # Also search by code pattern
-        response2 = requests.get(
-            f"{DHIS2_BASE_URL}/dataElements",
-            auth=auth,
-            params={
-                'fields': 'id,code,displayName,shortName',
-                'filter': f'code:ilike:033B-CD01',
-                'paging': 'false'
-            },
-            timeout=30
-        )
-        
-        if response2.status_code == 200:
-            data2 = response2.json()
-            elements2 = data2.get('dataElements', [])
-            # Merge and deduplicate
-            existing_ids = {e['id'] for e in elements}
-            for e in elements2:
-                if e['id'] not in existing_ids:
-                    elements.append(e)
+        search_cache.set(cache_key, elements)
         
         return jsonify({'dataElements': elements})
     
     except Exception as e:
-        print(f"Error searching data elements: {e}")
+        logger.error("Error searching data elements: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -310,19 +565,11 @@ def test_data_element():
         
         # Test with last 12 weeks
         current_year = datetime.now().year
-        periods = [f"{current_year}W{w:02d}" for w in range(1, 13)]
-        period_str = ";".join(periods)
+        periods = list(get_weekly_periods(current_year, 12))
         
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/analytics",
+        response = http_session.get(
+            analytics_url(element_id, get_weekly_period_param(current_year, 12), orgunit_id),
             auth=auth,
-            params=[
-                ('dimension', f'dx:{element_id}'),
-                ('dimension', f'pe:{period_str}'),
-                ('dimension', f'ou:{orgunit_id}'),
-                ('displayProperty', 'NAME'),
-                ('skipMeta', 'false')
-            ],
             timeout=60
         )
         
@@ -334,7 +581,7 @@ def test_data_element():
         }
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             result['has_data'] = 'rows' in data and len(data.get('rows', [])) > 0
             result['row_count'] = len(data.get('rows', []))
             if result['has_data']:
@@ -360,15 +607,13 @@ def find_element():
         element_id = find_malaria_data_element(auth)
         
         # Get element details
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/dataElements/{element_id}",
-            auth=auth,
-            params={'fields': 'id,code,displayName,shortName'},
-            timeout=30
+        status_code, element_info = get_metadata(
+            auth,
+            f'dataElements/{element_id}',
+            {'fields': 'id,code,displayName,shortName'}
         )
         
-        if response.status_code == 200:
-            element_info = response.json()
+        if status_code == 200:
             return jsonify({
                 'found': True,
                 'element': element_info
@@ -377,7 +622,7 @@ def find_element():
             return jsonify({
                 'found': False,
                 'element_id': element_id,
-                'error': f'Could not get details: {response.status_code}'
+                'error': f'Could not get details: {status_code}'
             })
     
     except Exception as e:
@@ -406,19 +651,10 @@ def debug_baseline():
         
         # Try to get just 1 year of data first
         test_year = end_year
-        periods = [f"{test_year}W{w:02d}" for w in range(1, 53)]
-        period_str = ";".join(periods)
         
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/analytics",
+        response = http_session.get(
+            analytics_url(element_id, get_weekly_period_param(test_year), orgunit_id, skip_meta=False),
             auth=auth,
-            params=[
-                ('dimension', f'dx:{element_id}'),
-                ('dimension', f'pe:{period_str}'),
-                ('dimension', f'ou:{orgunit_id}'),
-                ('displayProperty', 'NAME'),
-                ('skipMeta', 'false')
-            ],
             timeout=60
         )
         
@@ -431,7 +667,7 @@ def debug_baseline():
         }
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             result['row_count'] = len(data.get('rows', []))
             result['has_data'] = result['row_count'] > 0
             if result['has_data']:
@@ -450,13 +686,81 @@ def debug_baseline():
         return jsonify(result)
     
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("Error in debug_baseline: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
+# Discovered malaria data element IDs, keyed by DHIS2 username.
+# Entries expire hourly so a renamed/replaced element is eventually picked up.
+_malaria_element_cache = SimpleCache(default_ttl=3600)
+
+
 def find_malaria_data_element(auth):
     """
-    Find the malaria data element ID by searching for code pattern
+    Find the malaria data element ID.
+    The configured ID is verified with a single lookup first; the pattern
+    search only runs if that ID is not visible to the user. The ID does
+    not change between requests, so a successful lookup is cached per user.
+    With discovery disabled in config, the configured ID is used as is.
+    """
+    if not MALARIA_ELEMENT_DISCOVERY:
+        return MALARIA_DATA_ELEMENT['id']
+    
+    cached_id = _malaria_element_cache.get(auth.username)
+    if cached_id:
+        return cached_id
+    
+    element_id = verify_malaria_data_element(auth) or search_malaria_data_element(auth)
+    if element_id:
+        _malaria_element_cache.set(auth.username, element_id)
+        return element_id
+    
+    # Fallback to hardcoded ID
+    logger.warning("Using fallback data element ID")
+    return MALARIA_DATA_ELEMENT['id']
+
+
+def invalidate_malaria_data_element(auth):
+    """Forget the cached data element for this user so it is resolved again"""
+    _malaria_element_cache.delete(auth.username)
+
+
+def clear_malaria_caches():
+    """
+    Drop the caches private to this module (resolved element IDs, ETag
+    bodies and channel frames). The shared modules.core caches are cleared
+    by the app.
+    """
+    for cache in (_malaria_element_cache, _population_element_cache,
+                  metadata_etag_cache, analytics_etag_cache, channel_frames_cache):
+        cache.clear()
+
+
+def verify_malaria_data_element(auth):
+    """
+    Check that the configured malaria data element exists in DHIS2
+    Returns the configured ID, or None if it could not be confirmed
+    """
+    element_id = MALARIA_DATA_ELEMENT['id']
+    try:
+        response = http_session.get(
+            f"{DHIS2_BASE_URL}/dataElements/{element_id}",
+            auth=auth,
+            params={'fields': 'id'},
+            timeout=30
+        )
+        if response.status_code == 200:
+            return element_id
+        logger.info("Configured data element %s not available: %s", element_id, response.status_code)
+    except Exception as e:
+        logger.warning("Error verifying data element %s: %s", element_id, e)
+    return None
+
+
+def search_malaria_data_element(auth):
+    """
+    Search DHIS2 for the malaria data element ID by code and name patterns
+    Returns the element ID, or None if nothing matched
     """
     search_patterns = [
         '033B-CD01a',
@@ -465,150 +769,165 @@ def find_malaria_data_element(auth):
         'Malaria Confirmed Cases'
     ]
     
+    # One OR-joined request covers every code and name probe; the original
+    # probe order (code then name, pattern by pattern) is replayed locally
+    try:
+        elements = search_metadata_any(
+            auth,
+            'dataElements',
+            [(prop, pattern) for pattern in search_patterns for prop in ('code', 'displayName')],
+            'id,code,displayName'
+        )
+    except (RequestException, ValueError) as e:
+        logger.warning("Error searching for malaria data element: %s", e)
+        return None
+    
+    if not elements:
+        return None
+    
     for pattern in search_patterns:
-        try:
-            # Search by code
-            response = requests.get(
-                f"{DHIS2_BASE_URL}/dataElements",
-                auth=auth,
-                params={
-                    'fields': 'id,code,displayName',
-                    'filter': f'code:ilike:{pattern}',
-                    'paging': 'false'
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                elements = data.get('dataElements', [])
-                if elements:
-                    # Return first match
-                    print(f"Found malaria data element: {elements[0]}")
-                    return elements[0]['id']
-            
-            # Also search by name
-            response = requests.get(
-                f"{DHIS2_BASE_URL}/dataElements",
-                auth=auth,
-                params={
-                    'fields': 'id,code,displayName',
-                    'filter': f'displayName:ilike:{pattern}',
-                    'paging': 'false'
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                elements = data.get('dataElements', [])
-                # Look for confirmed cases specifically
-                for elem in elements:
-                    if 'confirmed' in elem.get('displayName', '').lower():
-                        print(f"Found malaria data element: {elem}")
-                        return elem['id']
-                if elements:
-                    print(f"Found malaria data element: {elements[0]}")
-                    return elements[0]['id']
-                    
-        except Exception as e:
-            print(f"Error searching for pattern {pattern}: {e}")
-            continue
+        by_code = [elem for elem in elements if ilike_matches(elem, 'code', pattern)]
+        if by_code:
+            logger.info("Found malaria data element: %s", by_code[0])
+            return by_code[0]['id']
+        
+        by_name = [elem for elem in elements if ilike_matches(elem, 'displayName', pattern)]
+        # Look for confirmed cases specifically
+        for elem in by_name:
+            if 'confirmed' in elem.get('displayName', '').lower():
+                logger.info("Found malaria data element: %s", elem)
+                return elem['id']
+        if by_name:
+            logger.info("Found malaria data element: %s", by_name[0])
+            return by_name[0]['id']
     
-    # Fallback to hardcoded ID
-    print("Using fallback data element ID")
-    return MALARIA_DATA_ELEMENT['id']
+    return None
+
+
+def fetch_malaria_year(auth, data_element, orgunit_id, year, refresh=False):
+    """
+    Fetch one year of weekly malaria data from DHIS2 Analytics API
+    Returns the raw analytics rows, or None if the request failed
+    """
+    url = analytics_url(data_element, get_weekly_period_param(year), orgunit_id)
+    ttl = ANALYTICS_TTL_HISTORICAL if year < datetime.now().year else ANALYTICS_TTL_CURRENT
+    
+    status_code, data = get_analytics(
+        auth,
+        f"{url}&skipData=false&ignoreLimit=true",
+        ttl=ttl,
+        timeout=120,
+        refresh=refresh
+    )
+    
+    logger.debug("Analytics response status for %s: %s", year, status_code)
+    
+    if status_code != 200:
+        return None
+    
+    if 'rows' not in data or len(data['rows']) == 0:
+        logger.debug("No rows in response for %s. Headers: %s", year, data.get('headers', []))
+        return []
+    
+    return data['rows']
 
 
-def fetch_malaria_data(auth, orgunit_id, start_year, end_year):
+def fetch_malaria_data(auth, orgunit_id, start_year, end_year, refresh=False):
     """
     Fetch malaria data from DHIS2 Analytics API
+    Each year is requested separately on the shared analytics pool, so
+    DHIS2 serves several small queries instead of one 260-period query.
     Returns DataFrame with: year, epi_week, confirmed_cases
     """
     try:
         # Find the correct data element ID
         data_element = find_malaria_data_element(auth)
-        print(f"Using data element ID: {data_element}")
+        logger.debug("Using data element ID: %s", data_element)
         
-        # Build period dimension (weekly periods)
-        periods = []
-        for year in range(start_year, end_year + 1):
-            for week in range(1, 53):
-                periods.append(f"{year}W{week:02d}")
+        years = list(range(start_year, end_year + 1))
         
-        period_str = ";".join(periods)
+        logger.debug("Fetching data for orgunit=%s, years=%s-%s", orgunit_id, start_year, end_year)
+        logger.debug("Total periods: %d", sum(get_last_epi_week(year) for year in years))
         
-        print(f"Fetching data for orgunit={orgunit_id}, years={start_year}-{end_year}")
-        print(f"Total periods: {len(periods)}")
+        def fetch_years(element_id):
+            return list(_analytics_executor.map(
+                lambda year: fetch_malaria_year(auth, element_id, orgunit_id, year, refresh),
+                years
+            ))
         
-        # Call analytics API
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/analytics",
-            auth=auth,
-            params=[
-                ('dimension', f'dx:{data_element}'),
-                ('dimension', f'pe:{period_str}'),
-                ('dimension', f'ou:{orgunit_id}'),
-                ('displayProperty', 'NAME'),
-                ('skipMeta', 'false')
-            ],
-            timeout=120
-        )
+        year_rows = fetch_years(data_element)
         
-        print(f"Analytics response status: {response.status_code}")
+        if any(year_data is None for year_data in year_rows):
+            # The cached element may have gone stale - re-resolve and retry once
+            invalidate_malaria_data_element(auth)
+            fresh_element = find_malaria_data_element(auth)
+            if fresh_element == data_element:
+                return pd.DataFrame()
+            logger.info("Data element changed from %s to %s, retrying", data_element, fresh_element)
+            year_rows = fetch_years(fresh_element)
+            if any(year_data is None for year_data in year_rows):
+                return pd.DataFrame()
         
-        if response.status_code != 200:
-            print(f"Analytics error: {response.status_code} - {response.text[:500]}")
-            return pd.DataFrame()
+        rows = [row for year_data in year_rows for row in year_data]
         
-        data = response.json()
-        
-        if 'rows' not in data or len(data['rows']) == 0:
-            print(f"No rows in response. Headers: {data.get('headers', [])}")
-            print(f"Metadata: {data.get('metaData', {}).get('dimensions', {})}")
+        if len(rows) == 0:
             return pd.DataFrame(columns=['year', 'epi_week', 'confirmed_cases'])
         
-        print(f"Found {len(data['rows'])} data rows")
-        
-        # Parse response
-        rows = []
-        for row in data['rows']:
-            # row format: [dx, pe, ou, value]
-            period = str(row[1])  # e.g., "2024W01"
-            try:
-                value = float(row[3]) if row[3] else 0.0
-            except (ValueError, TypeError):
-                value = 0.0
-            
-            try:
-                year = int(period[:4])
-                week = int(period[5:])
-            except (ValueError, TypeError):
-                continue  # Skip malformed periods
-            
-            rows.append({
-                'year': int(year),
-                'epi_week': int(week),
-                'confirmed_cases': float(value)
-            })
+        logger.debug("Found %d data rows", len(rows))
+        
+        # Parse response - row format: [dx, pe, ou, value]
+        # Transpose once and parse whole columns with NumPy
+        columns = list(zip(*rows))
+        periods = np.array(columns[1], dtype=str)  # e.g., "2024W01"
+        week_part = np.char.partition(periods, 'W')[:, 2]
         
-        df = pd.DataFrame(rows)
+        # Weekly case counts are whole numbers, exact in float32 up to ~16 million
+        cases = pd.to_numeric(np.array(columns[3], dtype=object), errors='coerce')
+        cases = np.nan_to_num(np.asarray(cases, dtype=np.float32), nan=0.0)
+        
+        try:
+            # Well-formed periods: build the typed frame in one shot
+            df = pd.DataFrame({
+                'year': periods.astype('U4').astype(np.int16),
+                'epi_week': week_part.astype(np.int8),
+                'confirmed_cases': cases
+            })
+        except (ValueError, OverflowError):
+            # Malformed period IDs present - parse leniently and skip them
+            df = pd.DataFrame({
+                'year': pd.to_numeric(periods.astype('U4'), errors='coerce'),
+                'epi_week': pd.to_numeric(week_part, errors='coerce'),
+                'confirmed_cases': cases
+            })
+            df = df.dropna(subset=['year', 'epi_week']).astype({
+                'year': np.int16,
+                'epi_week': np.int8
+            })
         
-        # Ensure proper types
-        if not df.empty:
-            df['year'] = df['year'].astype(int)
-            df['epi_week'] = df['epi_week'].astype(int)
-            df['confirmed_cases'] = df['confirmed_cases'].astype(float)
+        # Sort once here so downstream frames inherit chronological order
+        df = df.sort_values(['year', 'epi_week']).reset_index(drop=True)
         
-        print(f"Created DataFrame with {len(df)} rows")
+        logger.debug("Created DataFrame with %d rows", len(df))
         return df
     
     except Exception as e:
-        print(f"Error fetching malaria data: {e}")
-        traceback.print_exc()
+        logger.exception("Error fetching malaria data: %s", e)
         return pd.DataFrame()
 
 
+def fetch_baseline_and_current(auth, orgunit_id, start_year, end_year, current_year, refresh=False):
+    """
+    Fetch baseline and current year data in parallel.
+    Both are slow DHIS2 Analytics calls, so running them side by side
+    makes the wait roughly the longer of the two instead of the sum.
+    Returns (baseline_df, current_df)
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        baseline_future = executor.submit(fetch_malaria_data, auth, orgunit_id, start_year, end_year, refresh)
+        current_future = executor.submit(fetch_malaria_data, auth, orgunit_id, current_year, current_year, refresh)
+        return baseline_future.result(), current_future.result()
+
+
 @malaria_bp.route('/api/incidence-trend')
 @require_login
 def get_incidence_trend():
@@ -624,77 +943,77 @@ def get_incidence_trend():
         if not orgunit_id:
             return jsonify({'error': 'Organization unit ID required'}), 400
         
+        # The population lookup doesn't depend on the element or the cases,
+        # so start it first and let it overlap both (it also caches the name)
+        current_year = datetime.now().year
+        population_future = _analytics_executor.submit(
+            fetch_orgunit_population, auth, orgunit_id, current_year
+        )
+        
         # Find data element
         data_element = find_malaria_data_element(auth)
-        print(f"Incidence trend - Using data element: {data_element}")
+        logger.debug("Incidence trend - Using data element: %s", data_element)
         
         # Use DHIS2's built-in LAST_12_WEEKS relative period (more reliable)
         period_param = 'LAST_12_WEEKS'
         
-        print(f"Incidence trend - Fetching data for orgunit: {orgunit_id}")
+        logger.debug("Incidence trend - Fetching data for orgunit: %s", orgunit_id)
         
         # Fetch cases
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/analytics",
-            auth=auth,
-            params=[
+        status_code, data = get_analytics(
+            auth,
+            ANALYTICS_ENDPOINT,
+            params=(
                 ('dimension', f'dx:{data_element}'),
                 ('dimension', f'pe:{period_param}'),
                 ('dimension', f'ou:{orgunit_id}'),
-                ('displayProperty', 'NAME'),
-                ('skipMeta', 'false')
-            ],
-            timeout=60
+            ) + ANALYTICS_META_PARAMS
         )
         
-        print(f"Incidence trend - DHIS2 response: {response.status_code}")
+        logger.debug("Incidence trend - DHIS2 response: %s", status_code)
         
-        if response.status_code != 200:
-            print(f"Incidence trend - Error response: {response.text[:500]}")
-            return jsonify({'error': f'DHIS2 error: {response.status_code}'}), 500
+        if status_code != 200:
+            return jsonify({'error': f'DHIS2 error: {status_code}'}), 500
         
-        data = response.json()
         rows = data.get('rows', [])
         meta_dimensions = data.get('metaData', {}).get('dimensions', {})
         
         # Extract periods from response metadata (sorted chronologically)
         periods = sorted(meta_dimensions.get('pe', []))
         
-        print(f"Incidence trend - Got {len(rows)} data rows")
-        print(f"Incidence trend - Periods from response: {periods}")
+        logger.debug("Incidence trend - Got %d data rows", len(rows))
+        logger.debug("Incidence trend - Periods from response: %s", periods)
         
         # Parse cases into lookup
-        cases_lookup = {}
-        for row in rows:
-            period = row[1]
-            value = safe_float(row[3])
-            cases_lookup[period] = value
+        cases_lookup = analytics_value_lookup(rows, 1)
         
-        print(f"Incidence trend - Cases by period: {cases_lookup}")
+        logger.debug("Incidence trend - Cases by period: %s", cases_lookup)
         
         # Get population (from UBOS data or fetch from org unit)
-        current_year = datetime.now().year
-        population = fetch_orgunit_population(auth, orgunit_id, current_year)
-        print(f"Incidence trend - Population for orgunit: {population}")
-        
-        # Build incidence data in chronological order (using periods from response)
-        incidence_data = []
-        for period in periods:
-            cases = cases_lookup.get(period, 0)
-            incidence = calculate_incidence(cases, population)
-            incidence_data.append({
-                'period': period,
-                'cases': int(cases) if cases else 0,
-                'incidence': round(incidence, 2) if incidence else 0,
-                'population': population
-            })
+        population = population_future.result()
+        logger.debug("Incidence trend - Population for orgunit: %s", population)
+        
+        # Build incidence data in chronological order (using periods from response),
+        # computing all weeks' incidence per 1,000 in one array operation
+        cases = np.array([cases_lookup.get(period, 0) for period in periods], dtype=np.float64)
+        if population:
+            incidence = np.round(cases / population * 1000, 2)
+        else:
+            incidence = np.zeros_like(cases)
+        
+        incidence_data = [
+            {'period': period, 'cases': week_cases, 'incidence': week_incidence, 'population': population}
+            for period, week_cases, week_incidence in zip(
+                periods, cases.astype(np.int64).tolist(), incidence.tolist()
+            )
+        ]
         
         # Get org unit name
         orgunit_name = get_orgunit_name(auth, orgunit_id)
         
-        print(f"Incidence trend for {orgunit_name}: {len(incidence_data)} weeks")
+        logger.debug("Incidence trend for %s: %d weeks", orgunit_name, len(incidence_data))
         
-        return jsonify({
+        return json_response({
             'orgunit_id': orgunit_id,
             'orgunit_name': orgunit_name,
             'population': population,
@@ -703,8 +1022,7 @@ def get_incidence_trend():
         })
     
     except Exception as e:
-        print(f"Error in get_incidence_trend: {e}")
-        traceback.print_exc()
+        logger.exception("Error in get_incidence_trend: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -722,6 +1040,12 @@ def get_incidence_map():
         level = request.args.get('level', '3')  # Default to district level
         parent_id = request.args.get('parent')  # For drill-down
         
+        # Serve repeat map loads from the assembled payload
+        cache_key = analytics_cache._make_key('malaria_incidence_map', auth.username, level, parent_id)
+        cached = analytics_cache.get(cache_key)
+        if cached:
+            return json_response(cached)
+        
         # Find data element
         data_element = find_malaria_data_element(auth)
         
@@ -739,85 +1063,80 @@ def get_incidence_map():
             ou_dimension = f'ou:LEVEL-{level}'
         
         # Fetch current week cases
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/analytics",
-            auth=auth,
-            params=[
+        status_code, data = get_analytics(
+            auth,
+            ANALYTICS_ENDPOINT,
+            params=(
                 ('dimension', f'dx:{data_element}'),
                 ('dimension', f'pe:{current_period}'),
                 ('dimension', ou_dimension),
-                ('displayProperty', 'NAME'),
-                ('skipMeta', 'false')
-            ],
-            timeout=60
+            ) + ANALYTICS_LEVEL_PARAMS
         )
         
-        if response.status_code != 200:
-            return jsonify({'error': f'DHIS2 error: {response.status_code}'}), 500
+        if status_code != 200:
+            return jsonify({'error': f'DHIS2 error: {status_code}'}), 500
         
-        data = response.json()
         rows = data.get('rows', [])
         meta_items = data.get('metaData', {}).get('items', {})
+        meta_ous = data.get('metaData', {}).get('dimensions', {}).get('ou', [])
         
         # Parse cases by org unit
-        cases_by_ou = {}
-        for row in rows:
-            ou_id = row[2]
-            value = safe_float(row[3])
-            cases_by_ou[ou_id] = value
-        
-        # Fetch populations for all org units
-        populations = fetch_populations_for_level(auth, level, parent_id, current_year)
-        
-        # Calculate incidence for each org unit
-        incidence_by_ou = {}
-        for ou_id, cases in cases_by_ou.items():
-            population = populations.get(ou_id)
-            incidence = calculate_incidence(cases, population)
-            incidence_by_ou[ou_id] = incidence
-        
-        # Add org units with no cases but with population
-        for ou_id in populations.keys():
-            if ou_id not in incidence_by_ou:
-                incidence = calculate_incidence(0, populations[ou_id])
-                incidence_by_ou[ou_id] = incidence
-        
-        # Calculate quartile classification
-        color_mapping, thresholds = calculate_quartile_classification(incidence_by_ou)
-        
-        # Rank org units
-        ranked_data = rank_orgunits_by_incidence(incidence_by_ou)
+        cases_by_ou = analytics_value_lookup(rows, 2)
+        
+        # The response metadata already names every org unit in the
+        # dimension (including ones with no cases), so match those to UBOS
+        # directly instead of fetching the level's org units separately
+        if meta_ous:
+            populations, _ = match_ubos_populations({
+                ou_id: meta_items.get(ou_id, {}).get('name', ou_id) for ou_id in meta_ous
+            })
+        else:
+            populations = fetch_populations_for_level(auth, level, parent_id, current_year)
+        
+        # Calculate incidence for each org unit, then add org units with
+        # no cases but with population
+        incidence_by_ou = {
+            ou_id: calculate_incidence(cases, populations.get(ou_id))
+            for ou_id, cases in cases_by_ou.items()
+        }
+        incidence_by_ou.update(
+            (ou_id, calculate_incidence(0, population))
+            for ou_id, population in populations.items()
+            if ou_id not in incidence_by_ou
+        )
+        
+        # Quartile classification and ranks
+        color_mapping, thresholds, rank_by_ou = classify_and_rank_orgunits(incidence_by_ou)
         
         # Prepare response
-        orgunits_data = []
-        for ou_id, incidence in incidence_by_ou.items():
-            ou_info = meta_items.get(ou_id, {})
-            rank = next((r for o, i, r in ranked_data if o == ou_id), None)
-            
-            orgunits_data.append({
+        orgunits_data = [
+            {
                 'id': ou_id,
-                'name': ou_info.get('name', ou_id),
+                'name': meta_items.get(ou_id, {}).get('name', ou_id),
                 'cases': cases_by_ou.get(ou_id, 0),
                 'population': populations.get(ou_id),
                 'incidence': incidence,
                 'quartile': color_mapping[ou_id]['quartile'],
                 'color': color_mapping[ou_id]['color'],
                 'label': color_mapping[ou_id]['label'],
-                'rank': rank
-            })
+                'rank': rank_by_ou.get(ou_id)
+            }
+            for ou_id, incidence in incidence_by_ou.items()
+        ]
         
-        return jsonify({
+        result = {
             'period': current_period,
             'level': level,
             'parent_id': parent_id,
             'thresholds': thresholds,
             'total_orgunits': len(orgunits_data),
             'orgunits': orgunits_data
-        })
+        }
+        analytics_cache.set(cache_key, result, ttl=ANALYTICS_TTL_CURRENT)
+        return json_response(result)
     
     except Exception as e:
-        print(f"Error in get_incidence_map: {e}")
-        traceback.print_exc()
+        logger.exception("Error in get_incidence_map: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -836,37 +1155,46 @@ def get_incidence_table():
         level = request.args.get('level', '3')
         limit = int(request.args.get('limit', '150'))  # Get all districts, scrollable after 20
         
-        print(f"=== INCIDENCE TABLE: level={level}, limit={limit} ===")
+        logger.debug("Incidence table - level=%s, limit=%s", level, limit)
+        
+        # Serve repeat dashboard loads from the assembled payload
+        cache_key = analytics_cache._make_key('malaria_incidence_table', auth.username, level)
+        cached = analytics_cache.get(cache_key)
+        if cached:
+            return json_response(cached)
+        
+        # Population lookup overlaps the element lookup and the cases request
+        current_year = datetime.now().year
+        populations_future = _analytics_executor.submit(
+            fetch_populations_for_level, auth, level, None, current_year
+        )
         
         # Find data element
         data_element = find_malaria_data_element(auth)
-        print(f"Using malaria data element: {data_element}")
+        logger.debug("Using malaria data element: %s", data_element)
         
         # Use DHIS2's built-in LAST_12_WEEKS relative period (more reliable)
         period_param = 'LAST_12_WEEKS'
         
-        print(f"Incidence table - Using period: {period_param}")
+        logger.debug("Incidence table - Using period: %s", period_param)
         
         # Fetch cases for all org units
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/analytics",
-            auth=auth,
-            params=[
+        status_code, data = get_analytics(
+            auth,
+            ANALYTICS_ENDPOINT,
+            params=(
                 ('dimension', f'dx:{data_element}'),
                 ('dimension', f'pe:{period_param}'),
                 ('dimension', f'ou:LEVEL-{level}'),
-                ('displayProperty', 'NAME'),
-                ('skipMeta', 'false')
-            ],
+            ) + ANALYTICS_LEVEL_PARAMS,
             timeout=120
         )
         
-        print(f"Incidence table - DHIS2 response: {response.status_code}")
+        logger.debug("Incidence table - DHIS2 response: %s", status_code)
         
-        if response.status_code != 200:
-            return jsonify({'error': f'DHIS2 error: {response.status_code}'}), 500
+        if status_code != 200:
+            return jsonify({'error': f'DHIS2 error: {status_code}'}), 500
         
-        data = response.json()
         rows = data.get('rows', [])
         meta_items = data.get('metaData', {}).get('items', {})
         meta_dimensions = data.get('metaData', {}).get('dimensions', {})
@@ -874,112 +1202,116 @@ def get_incidence_table():
         # Extract periods from response metadata (sorted chronologically)
         periods = sorted(meta_dimensions.get('pe', []))
         
-        print(f"Got {len(rows)} data rows, {len(meta_items)} meta items")
-        print(f"Periods from response: {periods}")
+        logger.debug("Got %d data rows, %d meta items", len(rows), len(meta_items))
+        logger.debug("Periods from response: %s", periods)
         
         if not rows:
-            return jsonify({'periods': periods, 'orgunits': [], 'message': 'No data returned from DHIS2'})
-        
-        # Build cases by orgunit and period
-        cases_by_ou = {}
-        for row in rows:
-            ou_id = row[2]
-            period = row[1]
-            value = safe_float(row[3])
-            
-            if ou_id not in cases_by_ou:
-                cases_by_ou[ou_id] = {'cases': {}, 'total': 0}
-            
-            cases_by_ou[ou_id]['cases'][period] = value
-            cases_by_ou[ou_id]['total'] += value
+            return jsonify({'periods': periods, 'orgunit_ids': [], 'message': 'No data returned from DHIS2'})
+        
+        # Build an org unit x period case matrix (org units in first-seen order).
+        # IDs are factorized into integer category codes once, so the matrix is
+        # filled by code instead of hashing UID strings in a pivot/groupby
+        columns = list(zip(*rows))
+        ou_codes, ou_ids = pd.factorize(pd.Series(columns[2], dtype=object))
+        period_codes, row_periods = pd.factorize(pd.Series(columns[1], dtype=object))
+        values = pd.to_numeric(pd.Series(columns[3], dtype=object), errors='coerce').fillna(0.0).to_numpy()
         
-        print(f"Processed {len(cases_by_ou)} org units")
+        matrix = np.full((len(ou_ids), len(row_periods)), np.nan)
+        matrix[ou_codes, period_codes] = values
+        case_matrix = pd.DataFrame(matrix, index=ou_ids, columns=row_periods)
+        totals = pd.Series(np.bincount(ou_codes, weights=values, minlength=len(ou_ids)), index=ou_ids)
+        
+        logger.debug("Processed %d org units", len(case_matrix))
         
         # Try to fetch populations (but don't fail if not available)
         try:
-            current_year = datetime.now().year
-            populations = fetch_populations_for_level(auth, level, None, current_year)
-            print(f"Got {len(populations)} population records")
+            populations = populations_future.result()
+            logger.debug("Got %d population records", len(populations))
         except Exception as pop_err:
-            print(f"Population fetch failed: {pop_err}")
-            traceback.print_exc()
+            logger.exception("Population fetch failed: %s", pop_err)
             populations = {}
         
-        # Calculate average incidence for each org unit (for proper ranking)
         # Only include districts WITH population data
-        ous_with_population = []
-        ous_without_population = []
-        
-        for ou_id, ou_data in cases_by_ou.items():
-            population = populations.get(ou_id)
-            if population and population > 0:
-                # Calculate average incidence per week
-                week_incidences = []
-                for period, cases in ou_data['cases'].items():
-                    incidence = (cases / population) * 1000
-                    week_incidences.append(incidence)
-                ou_data['avg_incidence'] = sum(week_incidences) / len(week_incidences) if week_incidences else 0
-                ou_data['has_population'] = True
-                ous_with_population.append((ou_id, ou_data))
-            else:
-                # Track districts without population for logging
-                ou_info = meta_items.get(ou_id, {})
-                ous_without_population.append(ou_info.get('name', ou_id))
-        
-        # Log districts without population
-        if ous_without_population:
-            print(f"Districts WITHOUT population data ({len(ous_without_population)}): {', '.join(ous_without_population[:10])}...")
-        
-        print(f"Districts WITH population: {len(ous_with_population)}")
+        ou_population = pd.Series(populations, dtype=np.float64).reindex(case_matrix.index)
+        has_population = (ou_population > 0).to_numpy()
+        
+        # Log districts without population (count plus the first 10 names only)
+        if logger.isEnabledFor(logging.DEBUG) and not has_population.all():
+            ous_without_population = case_matrix.index[~has_population]
+            logger.debug(
+                "Districts WITHOUT population data (%d): %s...",
+                len(ous_without_population),
+                ', '.join(meta_items.get(ou_id, {}).get('name', ou_id) for ou_id in ous_without_population[:10])
+            )
+        
+        case_matrix = case_matrix[has_population]
+        ou_population = ou_population[has_population]
+        
+        logger.debug("Districts WITH population: %d", len(case_matrix))
+        
+        # Incidence per 1,000 for every org unit-week in one pass; the average
+        # (for ranking) is over the weeks each org unit actually reported
+        avg_incidence = (case_matrix.div(ou_population, axis=0) * 1000).mean(axis=1)
         
         # Sort org units by average incidence (worst hit at top) - NO LIMIT, show all
-        sorted_ous = sorted(ous_with_population, key=lambda x: x[1].get('avg_incidence', 0), reverse=True)
+        order = avg_incidence.sort_values(ascending=False, kind='stable').index
+        week_cases = case_matrix.reindex(index=order, columns=periods).fillna(0.0)
+        week_incidence = (week_cases.div(ou_population.reindex(order), axis=0) * 1000).round(2)
         
-        # Build table data
-        table_data = []
-        for ou_id, ou_data in sorted_ous:
-            ou_info = meta_items.get(ou_id, {})
-            population = populations.get(ou_id)
-            
-            row_dict = {
-                'orgunit_id': ou_id,
-                'orgunit_name': ou_info.get('name', ou_id),
-                'population': population,
-                'total_cases': int(ou_data['total']),
-                'avg_incidence': round(ou_data.get('avg_incidence', 0), 2),
-                'weeks': []
-            }
-            
-            for period in periods:
-                cases = ou_data['cases'].get(period, 0)
-                # Calculate incidence if population available
-                if population and population > 0:
-                    incidence = (cases / population) * 1000
-                else:
-                    incidence = None
-                
-                row_dict['weeks'].append({
-                    'period': period,
-                    'cases': cases,
-                    'incidence': round(incidence, 2) if incidence is not None else None
-                })
-            
-            table_data.append(row_dict)
+        # Columnar payload: parallel per-org-unit vectors plus org unit x period
+        # matrices, instead of a dict per org unit-week
+        orgunit_ids = order.tolist()
         
-        print(f"Returning {len(table_data)} org units in table")
+        logger.debug("Returning %d org units in table", len(orgunit_ids))
         
-        return jsonify({
+        result = {
             'periods': periods,
-            'orgunits': table_data,
+            'orgunit_ids': orgunit_ids,
+            'orgunit_names': [meta_items.get(ou_id, {}).get('name', ou_id) for ou_id in orgunit_ids],
+            'population': [populations.get(ou_id) for ou_id in orgunit_ids],
+            'total_cases': totals.reindex(order).astype(np.int64).tolist(),
+            'avg_incidence': [round(avg, 2) for avg in avg_incidence.reindex(order).tolist()],
+            'cases': week_cases.to_numpy().tolist(),
+            'incidence': week_incidence.to_numpy().tolist(),
             'has_population': len(populations) > 0
-        })
+        }
+        analytics_cache.set(cache_key, result, ttl=ANALYTICS_TTL_CURRENT)
+        return json_response(result)
     
     except Exception as e:
-        print(f"Error in get_incidence_table: {e}")
-        traceback.print_exc()
+        logger.exception("Error in get_incidence_table: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
+def fetch_orgunit_display_name(auth, orgunit_id):
+    """
+    Get an org unit's displayName, or None if DHIS2 did not return it.
+    Names rarely change, so they are cached per user in org_units_cache.
+    """
+    cache_key = org_units_cache._make_key('malaria_orgunit_name', auth.username, orgunit_id)
+    name = org_units_cache.get(cache_key)
+    if name is not None:
+        return name
+    
+    response = http_session.get(
+        f"{DHIS2_BASE_URL}/organisationUnits/{orgunit_id}",
+        auth=auth,
+        params={'fields': 'displayName'},
+        timeout=30
+    )
+    if response.status_code != 200:
+        return None
+    
+    data = parse_json(response)
+    if not isinstance(data, dict):
+        # e.g. a list or null body from a proxy; callers fall back to the ID
+        return None
+    
+    name = data.get('displayName', '')
+    org_units_cache.set(cache_key, name)
+    return name
+
+
 def fetch_orgunit_population(auth, orgunit_id, year):
     """
     Fetch population for a single org unit.
@@ -987,84 +1319,26 @@ def fetch_orgunit_population(auth, orgunit_id, year):
     """
     # First, get the org unit name from DHIS2
     try:
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/organisationUnits/{orgunit_id}",
-            auth=auth,
-            params={'fields': 'displayName'},
-            timeout=30
-        )
+        ou_name = fetch_orgunit_display_name(auth, orgunit_id)
         
-        if response.status_code == 200:
-            ou_name = response.json().get('displayName', '')
-            print(f"[Population] Looking up: '{ou_name}' (ID: {orgunit_id})")
-            
-            # Normalize for matching (uppercase, remove common suffixes)
-            normalized = ou_name.upper().replace(' DISTRICT', '').replace(' CITY', '').strip()
+        if ou_name is not None:
+            logger.debug("[Population] Looking up: '%s' (ID: %s)", ou_name, orgunit_id)
             
-            # Try exact match first
-            if normalized in UBOS_POPULATION:
-                pop = UBOS_POPULATION[normalized]
-                print(f"[Population] Found: {normalized} = {pop:,}")
+            pop, clean_name = match_ubos_population(ou_name)
+            if pop is not None:
+                logger.debug("[Population] Found: %s = %s", clean_name, pop)
                 return pop
             
-            # Try with CITY suffix (for cities like "Kampala" -> "KAMPALA CITY" in UBOS)
-            city_name = f"{normalized} CITY"
-            if city_name in UBOS_POPULATION:
-                pop = UBOS_POPULATION[city_name]
-                print(f"[Population] Found: {city_name} = {pop:,}")
-                return pop
-            
-            print(f"[Population] NOT FOUND: '{ou_name}' (tried: {normalized}, {city_name})")
+            logger.warning("[Population] NOT FOUND: '%s' (tried: %s)", ou_name, clean_name)
                 
     except Exception as e:
-        print(f"[Population] Error: {e}")
-        traceback.print_exc()
+        logger.exception("[Population] Error: %s", e)
     
     return None
-    
-    try:
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/analytics",
-            auth=auth,
-            params=[
-                ('dimension', f'dx:{POPULATION_DE}'),
-                ('dimension', f'pe:{year}'),
-                ('dimension', f'ou:{orgunit_id}'),
-                ('displayProperty', 'NAME')
-            ],
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            rows = data.get('rows', [])
-            if rows and len(rows) > 0:
-                return safe_float(rows[0][3])
-    except:
-        pass
-    
-    # Fallback: Try to get from org unit attributes
-    try:
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/organisationUnits/{orgunit_id}",
-            auth=auth,
-            params={'fields': 'attributeValues[value,attribute[id,name]]'},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            ou_data = response.json()
-            attr_values = ou_data.get('attributeValues', [])
-            
-            for attr in attr_values:
-                attr_name = attr.get('attribute', {}).get('name', '').lower()
-                if 'population' in attr_name or 'catchment' in attr_name:
-                    return safe_float(attr.get('value'))
-    except:
-        pass
-    
-    # Default fallback for testing
-    return 10000
+
+
+# Resolved population data element IDs, keyed by DHIS2 username
+_population_element_cache = SimpleCache(default_ttl=3600)
 
 
 def find_population_data_element(auth):
@@ -1072,8 +1346,39 @@ def find_population_data_element(auth):
     Search for population data element in DHIS2.
     Tries multiple search terms to find UBOS/population data.
     Excludes non-population items like facility counts, rates, etc.
+    A successful resolution is cached per user, since the ID does not
+    change between requests.
     """
-    print("\n=== SEARCHING FOR POPULATION DATA ELEMENT ===")
+    cached_id = _population_element_cache.get(auth.username)
+    if cached_id:
+        return cached_id
+    
+    element_id = search_population_data_element(auth)
+    if element_id:
+        _population_element_cache.set(auth.username, element_id)
+    return element_id
+
+
+# Words that indicate a data element is NOT a population count, compiled
+# into one alternation so each name is scanned once
+POPULATION_EXCLUDE_RE = re.compile('|'.join(map(re.escape, [
+    'facility', 'facilities', 'health', 'rate', 'ratio', '%', 'percent',
+    'proportion', 'coverage', 'indicator', 'number of', 'no.', 'no of',
+    'staff', 'worker', 'patient', 'visit', 'bed', 'equipment'
+])))
+
+# Looser filter for the population search endpoint, which lists candidates
+POPULATION_SEARCH_EXCLUDE_RE = re.compile('|'.join(map(re.escape, [
+    'rate', 'facility', 'facilities', '%', 'percent', 'proportion'
+])))
+
+
+def search_population_data_element(auth):
+    """
+    Run the population data element search (see find_population_data_element)
+    Returns the best matching element ID, or None
+    """
+    logger.debug("Searching for population data element")
     
     # Expanded search patterns for Uganda HMIS
     search_patterns = [
@@ -1093,53 +1398,36 @@ def find_population_data_element(auth):
         ('code', 'UBOS'),
     ]
     
-    # Words that indicate this is NOT a population count
-    exclude_words = [
-        'facility', 'facilities', 'health', 'rate', 'ratio', '%', 'percent', 
-        'proportion', 'coverage', 'indicator', 'number of', 'no.', 'no of',
-        'staff', 'worker', 'patient', 'visit', 'bed', 'equipment'
-    ]
-    
-    all_found = []
+    try:
+        elements = search_metadata_any(auth, 'dataElements', search_patterns, 'id,code,displayName,valueType')
+    except (RequestException, ValueError) as e:
+        logger.warning("Error searching for population data element: %s", e)
+        elements = None
     
-    for field, value in search_patterns:
-        try:
-            filter_param = f'{field}:ilike:{value}'
-            response = requests.get(
-                f"{DHIS2_BASE_URL}/dataElements",
-                auth=auth,
-                params={
-                    'filter': filter_param,
-                    'fields': 'id,code,displayName,valueType',
-                    'paging': 'false'
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                elements = data.get('dataElements', [])
-                
-                for el in elements:
-                    name_lower = el['displayName'].lower()
-                    
-                    # Skip if contains excluded words
-                    should_exclude = any(excl in name_lower for excl in exclude_words)
-                    
-                    if not should_exclude and el['id'] not in [e['id'] for e in all_found]:
-                        all_found.append(el)
-                        print(f"  ✓ Found: {el.get('code', 'N/A')} - {el['displayName']} (ID: {el['id']})")
-                    
-        except Exception as e:
-            print(f"Error searching for population ({field}:{value}): {e}")
+    # Keep the per-pattern order the individual searches used to produce
+    ranked = []
+    for el in elements or []:
+        name_lower = el['displayName'].lower()
+        
+        # Skip if contains excluded words
+        if POPULATION_EXCLUDE_RE.search(name_lower):
             continue
+        
+        pattern_index = next(
+            (i for i, (field, value) in enumerate(search_patterns) if ilike_matches(el, field, value)),
+            len(search_patterns)
+        )
+        ranked.append((pattern_index, el))
+    ranked.sort(key=lambda item: item[0])
+    
+    all_found = [el for _, el in ranked]
+    for el in all_found:
+        logger.debug("Found: %s - %s (ID: %s)", el.get('code', 'N/A'), el['displayName'], el['id'])
     
-    print(f"Total valid population elements found: {len(all_found)}")
+    logger.debug("Total valid population elements found: %d", len(all_found))
     
     if not all_found:
-        print("ERROR: No population data element found!")
-        print("Please visit: /malaria/api/search-population-elements to see all available options")
-        print("==============================================\n")
+        logger.warning("No population data element found - see /malaria/api/search-population-elements for available options")
         return None
     
     # Priority selection - look for best matches first
@@ -1157,47 +1445,108 @@ def find_population_data_element(auth):
         for el in all_found:
             name_lower = el['displayName'].lower()
             if all(p in name_lower for p in patterns):
-                print(f"*** SELECTED: {el['displayName']} (ID: {el['id']})")
-                print("==============================================\n")
+                logger.info("Selected population element: %s (ID: %s)", el['displayName'], el['id'])
                 return el['id']
     
     # Fallback to first numeric element
     for el in all_found:
         if el.get('valueType') in ['NUMBER', 'INTEGER', 'INTEGER_POSITIVE']:
-            print(f"*** FALLBACK: {el['displayName']} (ID: {el['id']})")
-            print("==============================================\n")
+            logger.info("Fallback population element: %s (ID: %s)", el['displayName'], el['id'])
             return el['id']
     
     # Last resort
-    print(f"*** LAST RESORT: {all_found[0]['displayName']} (ID: {all_found[0]['id']})")
-    print("==============================================\n")
+    logger.info("Last resort population element: %s (ID: %s)", all_found[0]['displayName'], all_found[0]['id'])
     return all_found[0]['id']
 
 
+# Common spelling variations between DHIS2 and UBOS
+UBOS_SPELLING_MAP = {
+    'LUWERO': 'LUWEERO',
+    'SEMBABULE': 'SSEMBABULE',
+    'SEMBAABULE': 'SSEMBABULE',
+    'BUKOMANSIMBI': 'BUKOMANSIMBI',
+    'LYANTONDE': 'LYANTONDE',
+}
+
+
+def _build_ubos_clean_index():
+    """
+    Index UBOS populations by cleaned name (no " DISTRICT"/" CITY"), folding
+    in the fallbacks in priority order: the UBOS name itself, then spelling
+    variants, then the "<name> CITY" entry (e.g. Kampala -> KAMPALA CITY).
+    """
+    index = dict(UBOS_POPULATION)
+    for variant, ubos_name in UBOS_SPELLING_MAP.items():
+        if ubos_name in UBOS_POPULATION:
+            index.setdefault(variant, UBOS_POPULATION[ubos_name])
+    for ubos_name, population in UBOS_POPULATION.items():
+        if ubos_name.endswith(' CITY'):
+            index.setdefault(ubos_name[:-len(' CITY')], population)
+    return index
+
+
+# Built once at import so each org unit match is at most two dict lookups
+_UBOS_CLEAN_INDEX = _build_ubos_clean_index()
+
+
+def match_ubos_population(ou_name):
+    """
+    Match a DHIS2 org unit name to its UBOS population.
+    Returns (population, cleaned_name); population is None if not found.
+    """
+    ou_name = ou_name.upper().strip()
+    
+    # Try exact match first (keeps e.g. "ARUA CITY" apart from "ARUA")
+    population = UBOS_POPULATION.get(ou_name)
+    if population is not None:
+        return population, ou_name
+    
+    # Otherwise match the cleaned name (remove "District", "City", etc.)
+    clean_name = ou_name.replace(' DISTRICT', '').replace(' CITY', '').strip()
+    return _UBOS_CLEAN_INDEX.get(clean_name), clean_name
+
+
+def match_ubos_populations(names_by_ou):
+    """
+    Map {orgunit_id: name} to UBOS populations.
+    Returns (populations, unmatched_names).
+    """
+    populations = {}
+    unmatched = []
+    for ou_id, name in names_by_ou.items():
+        population, clean_name = match_ubos_population(name)
+        if population is not None:
+            populations[ou_id] = population
+        else:
+            unmatched.append(clean_name)
+    return populations, unmatched
+
+
 def fetch_populations_for_level(auth, level, parent_id, year):
     """
     Get populations for all org units at a level.
     Uses UBOS_POPULATION from app.py (hardcoded official UBOS data).
     Maps org unit names to population values.
+    The mapping only depends on the level's org unit names, so it is cached
+    per user and level and shared by every incidence request (and year).
     """
     populations = {}
     
-    print(f"\n=== FETCHING POPULATION DATA (UBOS) ===")
-    print(f"Level: {level}, UBOS districts available: {len(UBOS_POPULATION)}")
+    logger.debug("Fetching UBOS population - level: %s, UBOS districts available: %d", level, len(UBOS_POPULATION))
     
     if not UBOS_POPULATION:
-        print("ERROR: UBOS_POPULATION not loaded!")
+        logger.error("UBOS_POPULATION not loaded!")
         return populations
     
+    cache_key = org_units_cache._make_key('malaria_level_populations', auth.username, level)
+    cached = org_units_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     # Get org unit names for the level
     try:
-        if parent_id:
-            ou_dimension = f'ou:{parent_id};LEVEL-{level}'
-        else:
-            ou_dimension = f'ou:LEVEL-{level}'
-        
         # Fetch org units to get their names
-        response = requests.get(
+        response = http_session.get(
             f"{DHIS2_BASE_URL}/organisationUnits",
             auth=auth,
             params={
@@ -1209,83 +1558,43 @@ def fetch_populations_for_level(auth, level, parent_id, year):
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             org_units = data.get('organisationUnits', [])
             
-            print(f"Found {len(org_units)} org units at level {level}")
+            logger.debug("Found %d org units at level %s", len(org_units), level)
             
-            # Common spelling variations between DHIS2 and UBOS
-            SPELLING_MAP = {
-                'LUWERO': 'LUWEERO',
-                'SEMBABULE': 'SSEMBABULE',
-                'SEMBAABULE': 'SSEMBABULE',
-                'BUKOMANSIMBI': 'BUKOMANSIMBI',
-                'LYANTONDE': 'LYANTONDE',
-            }
+            populations, unmatched = match_ubos_populations(
+                {ou['id']: ou['displayName'] for ou in org_units}
+            )
+            matched = len(populations)
             
-            matched = 0
-            unmatched = []
+            logger.debug("Matched %d/%d org units to UBOS population", matched, len(org_units))
             
-            for ou in org_units:
-                ou_id = ou['id']
-                ou_name = ou['displayName'].upper().strip()
+            if logger.isEnabledFor(logging.DEBUG):
+                if unmatched and len(unmatched) <= 10:
+                    logger.debug("Unmatched: %s", ', '.join(unmatched))
                 
-                # Try exact match first
-                if ou_name in UBOS_POPULATION:
-                    populations[ou_id] = UBOS_POPULATION[ou_name]
-                    matched += 1
-                else:
-                    # Try cleaning the name (remove "District", "City", etc.)
-                    clean_name = ou_name.replace(' DISTRICT', '').replace(' CITY', '').strip()
-                    
-                    if clean_name in UBOS_POPULATION:
-                        populations[ou_id] = UBOS_POPULATION[clean_name]
-                        matched += 1
-                    # Try spelling variation
-                    elif clean_name in SPELLING_MAP and SPELLING_MAP[clean_name] in UBOS_POPULATION:
-                        populations[ou_id] = UBOS_POPULATION[SPELLING_MAP[clean_name]]
-                        matched += 1
-                    else:
-                        # Try with "CITY" suffix
-                        city_name = f"{clean_name} CITY"
-                        if city_name in UBOS_POPULATION:
-                            populations[ou_id] = UBOS_POPULATION[city_name]
-                            matched += 1
-                        else:
-                            unmatched.append(clean_name)
-            
-            print(f"SUCCESS: Matched {matched}/{len(org_units)} org units to UBOS population")
-            
-            if unmatched and len(unmatched) <= 10:
-                print(f"Unmatched: {', '.join(unmatched[:10])}")
-            
-            # Show sample
-            sample = list(populations.items())[:3]
-            for ou_id, pop in sample:
-                print(f"  Sample: {ou_id} = {pop:,.0f}")
+                # Show sample
+                for ou_id, pop in islice(populations.items(), 3):
+                    logger.debug("Sample: %s = %s", ou_id, pop)
                 
     except Exception as e:
-        print(f"Error fetching org units: {e}")
-        traceback.print_exc()
+        logger.exception("Error fetching org units: %s", e)
     
-    print(f"=== END POPULATION FETCH: {len(populations)} records ===\n")
+    logger.debug("Population fetch complete: %d records", len(populations))
+    if populations:
+        org_units_cache.set(cache_key, populations)
     return populations
 
 
 def get_orgunit_name(auth, orgunit_id):
     """Get organisation unit name."""
     try:
-        response = requests.get(
-            f"{DHIS2_BASE_URL}/organisationUnits/{orgunit_id}",
-            auth=auth,
-            params={'fields': 'displayName'},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            return response.json().get('displayName', orgunit_id)
-    except:
-        pass
+        name = fetch_orgunit_display_name(auth, orgunit_id)
+        if name:
+            return name
+    except (RequestException, ValueError) as e:
+        logger.debug("Could not fetch name for %s: %s", orgunit_id, e)
     
     return orgunit_id
 
@@ -1314,44 +1623,45 @@ def get_geojson():
         if parent_id:
             params['parent'] = parent_id
         
-        print(f"Fetching GeoJSON for level {level}, parent: {parent_id}")
+        logger.debug("Fetching GeoJSON for level %s, parent: %s", level, parent_id)
         
-        response = requests.get(
+        response = http_session.get(
             f"{DHIS2_BASE_URL}/organisationUnits.geojson",
             auth=auth,
             params=params,
             timeout=120
         )
         
-        print(f"GeoJSON response status: {response.status_code}")
+        logger.debug("GeoJSON response status: %s", response.status_code)
         
         if response.status_code != 200:
-            print(f"GeoJSON error: {response.text[:500]}")
+            logger.warning("GeoJSON error: %s", response.text[:500])
             return jsonify({'error': f'DHIS2 GeoJSON error: {response.status_code}'}), 500
         
-        geojson = response.json()
+        geojson = parse_json(response)
         
         # Verify it's valid GeoJSON
         if 'features' not in geojson:
             return jsonify({'error': 'Invalid GeoJSON response'}), 500
         
-        features = geojson.get('features', [])
-        valid_features = [f for f in features if f.get('geometry') and f['geometry'].get('coordinates')]
-        
-        print(f"Fetched {len(features)} features, {len(valid_features)} have valid geometry")
-        
-        # Log first feature structure for debugging
-        if features:
-            sample = features[0]
-            print(f"Sample feature: id={sample.get('id')}, has_geometry={sample.get('geometry') is not None}")
-            if sample.get('properties'):
-                print(f"Sample properties keys: {list(sample['properties'].keys())[:5]}")
-        
-        return jsonify(geojson)
+        if logger.isEnabledFor(logging.DEBUG):
+            features = geojson.get('features', [])
+            valid_features = [f for f in features if f.get('geometry') and f['geometry'].get('coordinates')]
+            
+            logger.debug("Fetched %d features, %d have valid geometry", len(features), len(valid_features))
+            
+            # Log first feature structure for debugging
+            if features:
+                sample = features[0]
+                logger.debug("Sample feature: id=%s, has_geometry=%s", sample.get('id'), sample.get('geometry') is not None)
+                if sample.get('properties'):
+                    logger.debug("Sample properties keys: %s", list(sample['properties'].keys())[:5])
+        
+        # Pass DHIS2's body straight through instead of re-serializing it
+        return Response(response.content, mimetype='application/json')
     
     except Exception as e:
-        print(f"Error fetching GeoJSON: {e}")
-        traceback.print_exc()
+        logger.exception("Error fetching GeoJSON: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1374,66 +1684,66 @@ def search_population_elements():
             'pop total', 'total pop', 'district pop'
         ]
         
-        results = []
+        indicator_terms = ['population', 'UBOS', 'projected']
         
-        for term in search_terms:
-            response = requests.get(
-                f"{DHIS2_BASE_URL}/dataElements",
-                auth=auth,
-                params={
-                    'filter': f'displayName:ilike:{term}',
-                    'fields': 'id,code,displayName,valueType,categoryCombo[name]',
-                    'paging': 'false'
-                },
-                timeout=30
+        def first_term_index(name_lower, terms):
+            # Position of the first search term the name matches (ilike is a
+            # case-insensitive substring match), to keep the per-term grouping
+            return next(
+                (i for i, term in enumerate(terms) if term.lower() in name_lower),
+                len(terms)
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                for element in data.get('dataElements', []):
-                    # Avoid duplicates and filter out non-population items
-                    name_lower = element['displayName'].lower()
-                    # Exclude if it's clearly not population
-                    if any(x in name_lower for x in ['rate', 'facility', 'facilities', '%', 'percent', 'proportion']):
-                        continue
-                    
-                    if element['id'] not in [r['id'] for r in results]:
-                        results.append({
-                            'id': element['id'],
-                            'code': element.get('code', ''),
-                            'name': element['displayName'],
-                            'valueType': element.get('valueType', ''),
-                            'category': element.get('categoryCombo', {}).get('name', ''),
-                            'matched_term': term
-                        })
+        
+        # The indicator search is independent - run it alongside the element search
+        indicators_future = _analytics_executor.submit(
+            search_metadata_any, auth, 'indicators', [('displayName', term) for term in indicator_terms],
+            'id,code,displayName,indicatorType[name]'
+        )
+        
+        matched = []
+        elements = search_metadata_any(
+            auth, 'dataElements', [('displayName', term) for term in search_terms],
+            'id,code,displayName,valueType,categoryCombo[name]'
+        )
+        for element in elements or []:
+            name_lower = element['displayName'].lower()
+            # Exclude if it's clearly not population
+            if POPULATION_SEARCH_EXCLUDE_RE.search(name_lower):
+                continue
+            matched.append((first_term_index(name_lower, search_terms), element))
+        matched.sort(key=lambda item: item[0])
+        
+        results = [
+            {
+                'id': element['id'],
+                'code': element.get('code', ''),
+                'name': element['displayName'],
+                'valueType': element.get('valueType', ''),
+                'category': element.get('categoryCombo', {}).get('name', ''),
+                'matched_term': search_terms[term_index] if term_index < len(search_terms) else ''
+            }
+            for term_index, element in matched
+        ]
         
         # Also search indicators
-        indicator_results = []
-        for term in ['population', 'UBOS', 'projected']:
-            response = requests.get(
-                f"{DHIS2_BASE_URL}/indicators",
-                auth=auth,
-                params={
-                    'filter': f'displayName:ilike:{term}',
-                    'fields': 'id,code,displayName,indicatorType[name]',
-                    'paging': 'false'
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                for indicator in data.get('indicators', []):
-                    name_lower = indicator['displayName'].lower()
-                    if 'rate' not in name_lower and '%' not in name_lower:
-                        if indicator['id'] not in [r['id'] for r in indicator_results]:
-                            indicator_results.append({
-                                'id': indicator['id'],
-                                'code': indicator.get('code', ''),
-                                'name': indicator['displayName'],
-                                'type': 'indicator',
-                                'indicatorType': indicator.get('indicatorType', {}).get('name', '')
-                            })
+        matched = []
+        indicators = indicators_future.result()
+        for indicator in indicators or []:
+            name_lower = indicator['displayName'].lower()
+            if 'rate' not in name_lower and '%' not in name_lower:
+                matched.append((first_term_index(name_lower, indicator_terms), indicator))
+        matched.sort(key=lambda item: item[0])
+        
+        indicator_results = [
+            {
+                'id': indicator['id'],
+                'code': indicator.get('code', ''),
+                'name': indicator['displayName'],
+                'type': 'indicator',
+                'indicatorType': indicator.get('indicatorType', {}).get('name', '')
+            }
+            for _, indicator in matched
+        ]
         
         # Sort by relevance (UBOS and population keywords first)
         def relevance_score(item):
@@ -1450,14 +1760,13 @@ def relevance_score(item):
         results.sort(key=relevance_score)
         indicator_results.sort(key=relevance_score)
         
-        print(f"\n=== POPULATION SEARCH RESULTS ===")
-        print(f"Found {len(results)} data elements:")
-        for r in results[:10]:  # Show top 10
-            print(f"  - {r['code']}: {r['name']} (ID: {r['id']})")
-        print(f"Found {len(indicator_results)} indicators:")
-        for r in indicator_results[:5]:
-            print(f"  - {r['code']}: {r['name']} (ID: {r['id']})")
-        print("=================================\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Population search - found %d data elements", len(results))
+            for r in results[:10]:  # Show top 10
+                logger.debug("  - %s: %s (ID: %s)", r['code'], r['name'], r['id'])
+            logger.debug("Population search - found %d indicators", len(indicator_results))
+            for r in indicator_results[:5]:
+                logger.debug("  - %s: %s (ID: %s)", r['code'], r['name'], r['id'])
         
         return jsonify({
             'data_elements': results,
@@ -1466,8 +1775,7 @@ def relevance_score(item):
         })
     
     except Exception as e:
-        print(f"Error searching population elements: {e}")
-        traceback.print_exc()
+        logger.exception("Error searching population elements: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1483,7 +1791,7 @@ def search_w01_elements():
             return jsonify({'error': 'Authentication required'}), 401
         
         # Search for W01 code prefix
-        response = requests.get(
+        response = http_session.get(
             f"{DHIS2_BASE_URL}/dataElements",
             auth=auth,
             params={
@@ -1496,14 +1804,12 @@ def search_w01_elements():
         
         results = []
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             results = data.get('dataElements', [])
         
-        print(f"\n=== W01 DATA ELEMENTS FOUND ===")
         for el in results:
-            print(f"  {el.get('code', 'N/A')}: {el['displayName']} (ID: {el['id']})")
-        print(f"Total W01 elements: {len(results)}")
-        print("================================\n")
+            logger.debug("W01 element %s: %s (ID: %s)", el.get('code', 'N/A'), el['displayName'], el['id'])
+        logger.debug("Total W01 elements: %d", len(results))
         
         return jsonify({
             'w01_elements': results,
@@ -1511,7 +1817,7 @@ def search_w01_elements():
         })
     
     except Exception as e:
-        print(f"Error searching W01: {e}")
+        logger.error("Error searching W01: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1530,7 +1836,13 @@ def get_orgunit_children():
         if not parent_id:
             return jsonify({'error': 'Parent ID required'}), 400
         
-        response = requests.get(
+        # The hierarchy rarely changes, so drill-downs are served from cache
+        cache_key = org_units_cache._make_key('malaria_orgunit_children', auth.username, parent_id)
+        cached = org_units_cache.get(cache_key)
+        if cached:
+            return json_response(cached)
+        
+        response = http_session.get(
             f"{DHIS2_BASE_URL}/organisationUnits/{parent_id}",
             auth=auth,
             params={
@@ -1542,18 +1854,20 @@ def get_orgunit_children():
         if response.status_code != 200:
             return jsonify({'error': f'DHIS2 error: {response.status_code}'}), 500
         
-        data = response.json()
+        data = parse_json(response)
         children = data.get('children', [])
         
-        return jsonify({
+        result = {
             'parent': {
                 'id': data.get('id'),
                 'name': data.get('displayName'),
                 'level': data.get('level')
             },
             'children': children
-        })
+        }
+        org_units_cache.set(cache_key, result)
+        return json_response(result)
     
     except Exception as e:
-        print(f"Error fetching children: {e}")
+        logger.error("Error fetching children: %s", e)
         return jsonify({'error': str(e)}), 500
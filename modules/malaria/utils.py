@@ -5,6 +5,8 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+from urllib.parse import quote_plus
 
 
 def safe_float(val, default=0.0):
@@ -60,6 +62,42 @@ def epi_week_to_date(year, week):
     return target_date
 
 
+def get_last_epi_week(year):
+    """
+    Last ISO week of a year: 52, or 53 for long years (e.g. 2020, 2026)
+    28 December always falls in the final week
+    """
+    return datetime(year, 12, 28).isocalendar()[1]
+
+
+@lru_cache(maxsize=128)
+def get_weekly_periods(year, last_week=None):
+    """
+    DHIS2 weekly period IDs for weeks 1..last_week of a year (e.g. 2024W01)
+    last_week defaults to the year's final ISO week, so only real periods are requested
+    Cached as a tuple since the same years are requested repeatedly
+    """
+    if last_week is None:
+        last_week = get_last_epi_week(year)
+    return tuple(f"{year}W{week:02d}" for week in range(1, last_week + 1))
+
+
+@lru_cache(maxsize=128)
+def get_weekly_period_string(year, last_week=None):
+    """
+    Semicolon-joined weekly periods for an Analytics pe: dimension
+    """
+    return ";".join(get_weekly_periods(year, last_week))
+
+
+@lru_cache(maxsize=128)
+def get_weekly_period_param(year, last_week=None):
+    """
+    URL-encoded weekly period string, ready to drop into an Analytics URL
+    """
+    return quote_plus(get_weekly_period_string(year, last_week))
+
+
 def format_week_label(week):
     """
     Format week number for display
@@ -241,6 +279,16 @@ def detect_consecutive_alerts(alert_weeks, consecutive_count=2):
     return list(set(confirmed_alerts))
 
 
+def iter_csv_chunks(df, chunk_size=500):
+    """
+    Yield a DataFrame as CSV text in row chunks, header first
+    Lets a streaming response start sending before the whole CSV is built
+    """
+    yield df.iloc[:0].to_csv(index=False)
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size].to_csv(index=False, header=False)
+
+
 def calculate_summary_stats(current_data, baseline_stats):
     """
     Calculate summary statistics for dashboard